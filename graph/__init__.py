@@ -1,3 +1,3 @@
-from .nodes import process_input, process_pdf, summarize_page, search_summaries, verify_results
-from .state import State
-from .parsers import input_parser, summary_parser, search_result_list_parser
+from .nodes import process_input, process_pdf, summarize_page, store_summaries, search_summaries, verify_results, route_to_summarize, route_after_search
+from .state import State, ShardState
+from .parsers import PageSummary, SearchResultList, VerificationResult, json_schema_format
@@ -1,9 +1,70 @@
 import asyncio
-
-from tools.llm import llm
-from tools.tools import pdf_tool, normalizer_tool
-from .parsers import SearchResult, input_parser, summary_parser, search_result_list_parser, verification_parser
-from .state import State
+import orjson
+import os
+import weakref
+from difflib import SequenceMatcher
+from itertools import islice
+
+from tools.llm import llm_clients, LLM_CONCURRENCY, LLM_MODEL, LLM_TEMPERATURE, LLM_SEED
+from tools.tools import pdf_tool, normalizer_tool, document_cache
+from langchain_core.callbacks import adispatch_custom_event
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import END
+from langgraph.types import Send
+from .parsers import (
+    PageSummary, BatchPageSummaries, SearchResult, SearchResultList, VerificationResult,
+    PAGE_SUMMARY_TA, BATCH_SUMMARIES_TA, SEARCH_RESULTS_TA, VERIFICATION_TA,
+    json_schema_format,
+)
+from .state import State, ShardState
+
+# Schema-pinned LLMs: OpenAI enforces the JSON schema server-side, so prompts need no format instructions.
+# Only the response text is cached; it is validated locally with the matching TypeAdapter.
+SUMMARIZE_FORMAT = json_schema_format(BatchPageSummaries)
+SEARCH_FORMAT = json_schema_format(SearchResultList)
+VERIFY_FORMAT = json_schema_format(VerificationResult)
+
+# Number of pages packed into a single summarization request
+PAGES_PER_BATCH = 8
+
+# Pages with less text than this (blank pages, bare headers/footers) are not summarized
+MIN_PAGE_CHARS = 80
+
+# Number of pages handed to each parallel summarize_page run; a whole number of batches,
+# so no shard ends in a partial request
+PAGES_PER_SHARD = 3 * PAGES_PER_BATCH
+
+# Number of points the search asks the LLM for
+MAX_SEARCH_RESULTS = 10
+
+# Characters of page context kept on each side of the matched span in verification prompts,
+# and the shortest exact overlap trusted to locate that span
+VERIFY_CONTEXT_CHARS = 200
+VERIFY_MIN_MATCH = 20
+
+# Approximate characters of a verification prompt besides the page text (instructions plus the point)
+VERIFY_PROMPT_CHARS = 800
+
+# Optional fixed cap on raw page characters embedded in a fused search prompt; unset means
+# the cap is estimated per document by fused_search_budget
+FUSED_SEARCH_CHAR_BUDGET = int(os.getenv("FUSED_SEARCH_CHAR_BUDGET", "0")) or None
+
+# Schema pinned on every Batch API request, matching the LangChain calls above
+PAGE_SUMMARY_FORMAT = json_schema_format(PageSummary)
+
+# Polling bounds (seconds) while waiting on an OpenAI Batch API job
+BATCH_POLL_INITIAL = 5
+BATCH_POLL_MAX = 300
+
+# One semaphore per event loop, shared by every node and shard running on it
+_llm_semaphores = weakref.WeakKeyDictionary()
+
+def llm_semaphore() -> asyncio.Semaphore:
+    """Returns the semaphore capping in-flight LLM requests on the running event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _llm_semaphores:
+        _llm_semaphores[loop] = asyncio.Semaphore(LLM_CONCURRENCY)
+    return _llm_semaphores[loop]
 
 
 async def process_input(state: State):
@@ -22,127 +83,447 @@ async def process_input(state: State):
 
     return {"query": user_message}  # Only return query; Streamlit provides `pdf_path`
 
-def process_pdf(state: State):
+async def process_pdf(state: State):
     pdf_path = state.get("pdf_path")
     if not pdf_path:
         raise ValueError("PDF path not found.")
 
-    # Use the PDF tool to extract the pages
-    pdf_result = pdf_tool.invoke({"pdf_path": pdf_path})
+    # A document seen before brings back its pages and any summaries, skipping extraction
+    document_id = state.get("document_id")
+    cached = await asyncio.to_thread(document_cache.load, document_id) if document_id else None
+    if cached and cached.get("page_numbers"):
+        return {
+            "page_numbers": cached["page_numbers"],
+            "page_contents": cached["page_contents"],
+            "summary_page_numbers": cached.get("summary_page_numbers", []),
+            "summary_headings": cached.get("summary_headings", []),
+            "summary_key_points": cached.get("summary_key_points", []),
+        }
+
+    # Use the PDF tool to extract the pages in a worker thread so the event loop stays free
+    pdf_result = await asyncio.to_thread(pdf_tool.invoke, {"pdf_path": pdf_path})
     pages = pdf_result.get("pages", [])
 
-    # Attach both content and page number for processing
-    extracted_pages = [
-        {"page_number": page["page_number"], "content": page["content"]}
-        for page in pages
+    # Keep page numbers and contents as parallel lists
+    extracted = {
+        "page_numbers": [page["page_number"] for page in pages],
+        "page_contents": [page["content"] for page in pages],
+    }
+    if document_id:
+        await asyncio.to_thread(document_cache.save, document_id, **extracted)
+    return extracted
+
+def build_page_summary_prompt(page_number: int, content: str) -> str:
+    """Builds the single-page summarization prompt used by the Batch API path."""
+    return (
+        f"You are an advanced document summarizer. Summarize the following content from page {page_number} of a document. "
+        "Your summary should have a heading sentence and three key points. Ensure that at least one of the points is qualitative "
+        "and one is quantitative. Each point should reflect significant facts or insights and be concise. Below is the content for summarization:\n\n"
+        f'"{content}"'
+    )
+
+async def summarize_with_batch_api(page_numbers, page_contents):
+    """
+    Summarizes pages through the OpenAI Batch API.
+    Trades latency (up to the 24h completion window) for half the token cost and higher rate limits.
+    """
+    openai_client = llm_clients().openai_client
+
+    # Serialize one chat completion request per page
+    lines = [
+        orjson.dumps({
+            "custom_id": f"page-{page_number}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": LLM_MODEL,
+                "temperature": LLM_TEMPERATURE,
+                "seed": LLM_SEED,
+                "response_format": PAGE_SUMMARY_FORMAT,
+                "messages": [{
+                    "role": "user",
+                    "content": build_page_summary_prompt(page_number, content),
+                }],
+            },
+        })
+        for page_number, content in zip(page_numbers, page_contents)
     ]
-    return {"extracted_pages": extracted_pages}
 
-async def summarize_page(state: State):
-    async def summarize(page_data):
-        """Helper function to invoke LLM asynchronously for summarization."""
-        page_number = page_data["page_number"]
-        content = page_data["content"]
+    # Upload the requests and start the batch job
+    batch_file = await openai_client.files.create(
+        file=("summaries.jsonl", b"\n".join(lines)),
+        purpose="batch",
+    )
+    batch = None
+    try:
+        batch = await openai_client.batches.create(
+            endpoint="/v1/chat/completions",
+            input_file_id=batch_file.id,
+            completion_window="24h",
+        )
+
+        # Poll with exponential backoff until the job settles
+        delay = BATCH_POLL_INITIAL
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX)
+            batch = await openai_client.batches.retrieve(batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            raise ValueError(f"Summarization batch {batch.id} ended with status '{batch.status}'.")
+
+        # Download the results and parse each page's response
+        output = await openai_client.files.content(batch.output_file_id)
+    finally:
+        # Uploaded requests and results hold document text, so don't leave them in file storage
+        file_ids = [batch_file.id]
+        if batch is not None:
+            file_ids += [file_id for file_id in (batch.output_file_id, batch.error_file_id) if file_id]
+        for file_id in file_ids:
+            try:
+                await openai_client.files.delete(file_id)
+            except Exception as e:
+                print(f"Error deleting batch file {file_id}: {e}")
+
+    # Accept exactly one summary per requested page, matched through its custom_id
+    requested = {f"page-{page_number}": page_number for page_number in page_numbers}
+    summaries = {}
+    for line in output.content.splitlines():
+        if not line.strip():
+            continue
+        # One bad line shouldn't discard every other page of the batch
+        try:
+            record = orjson.loads(line)
+            custom_id = record.get("custom_id")
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                print(f"Batch request {custom_id} failed: {record.get('error')}")
+                continue
+            page_number = requested.get(custom_id)
+            if page_number is None or page_number in summaries:
+                print(f"Skipping unexpected or duplicate batch result '{custom_id}'.")
+                continue
+            content = response["body"]["choices"][0]["message"]["content"]
+            summary = PAGE_SUMMARY_TA.validate_json(content)
+            if summary.page_number != page_number:
+                print(f"Batch result '{custom_id}' summarizes page {summary.page_number}; skipping it.")
+                continue
+            summaries[page_number] = summary
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            print(f"Error parsing batch result line {line[:100]!r}: {e}")
+    return list(summaries.values())
+
+def substantive_pages(page_numbers, page_contents):
+    """Returns the (page_number, content) pairs with enough text to be worth summarizing."""
+    return [
+        (page_number, content)
+        for page_number, content in zip(page_numbers, page_contents)
+        if len(content.strip()) >= MIN_PAGE_CHARS
+    ]
+
+def route_to_summarize(state: State):
+    """
+    Fans summarization out as one summarize_page run per shard of pages.
+    Goes straight to search when summaries came from the document cache.
+    """
+    if state.get("summary_page_numbers"):
+        return "search_summaries"
+
+    # Skip near-empty pages; the full page lists stay in state for verification
+    pages = substantive_pages(state["page_numbers"], state["page_contents"])
+    if not pages:
+        raise ValueError("No pages with enough text to summarize.")
+
+    # A Batch API job already parallelizes server-side, so it gets a single shard
+    shard_size = len(pages) if state.get("use_batch_api") else PAGES_PER_SHARD
+    return [
+        Send("summarize_page", {
+            "page_numbers": [page_number for page_number, _ in shard],
+            "page_contents": [content for _, content in shard],
+            "total_pages": len(pages),
+            "use_batch_api": state.get("use_batch_api", False),
+        })
+        for shard in (pages[i:i + shard_size] for i in range(0, len(pages), shard_size))
+    ]
+
+async def summarize_page(state: ShardState, config: RunnableConfig):
+    """Summarizes one shard of pages; the State reducers merge shards together."""
+    # Share the LLM cap with every other shard so the fan-out can't trigger 429 retry storms
+    llm_sem = llm_semaphore()
+
+    async def summarize(batch, retries=1):
+        """
+        Helper function to summarize a batch of pages with a single LLM call.
+        Pages the response leaves out are retried once; pages it invents are dropped.
+        """
+        pages_block = "\n\n".join(
+            f'Page {page_number}:\n"{content}"'
+            for page_number, content in batch
+        )
 
         # Define the prompt
         prompt = (
-            f"You are an advanced document summarizer. Summarize the following content from page {page_number} of a document. "
-            "Your summary should have a heading sentence and three key points. Ensure that at least one of the points is qualitative "
-            "and one is quantitative. Each point should reflect significant facts or insights and be concise. Below is the content for summarization:\n\n"
-            f'"{content}"\n\n'
-            "Please respond using the following structure in valid JSON format:\n"
-            f"{summary_parser.get_format_instructions()}"
+            f"You are an advanced document summarizer. Summarize each of the following {len(batch)} pages of a document separately. "
+            "Each summary should have a heading sentence and three key points. Ensure that at least one of the points is qualitative "
+            "and one is quantitative. Each point should reflect significant facts or insights and be concise. "
+            "Return exactly one summary per page and keep the page numbers as given. Below is the content for summarization:\n\n"
+            f"{pages_block}"
         )
 
-        # Invoke the LLM and parse the response
-        response = await llm.ainvoke([{"role": "user", "content": prompt}])
-        return summary_parser.parse(response.content)
+        # Invoke the schema-pinned LLM
+        async with llm_sem:
+            summarize_llm = llm_clients().llm.bind(response_format=SUMMARIZE_FORMAT)
+            response = await summarize_llm.ainvoke([{"role": "user", "content": prompt}])
+
+        # Keep exactly one summary per requested page
+        requested_pages = {page_number for page_number, _ in batch}
+        summaries = {}
+        for summary in BATCH_SUMMARIES_TA.validate_json(response.content).summaries:
+            if summary.page_number not in requested_pages:
+                print(f"Dropping summary for unrequested Page {summary.page_number}")
+                continue
+            summaries.setdefault(summary.page_number, summary)
+
+        missing = [(page_number, content) for page_number, content in batch if page_number not in summaries]
+        if missing:
+            missing_pages = ", ".join(str(page_number) for page_number, _ in missing)
+            if retries:
+                print(f"Retrying summaries for missing pages: {missing_pages}")
+                return list(summaries.values()) + await summarize(missing, retries - 1)
+            print(f"No summary returned for pages: {missing_pages}")
+        return list(summaries.values())
+
+    page_numbers = state["page_numbers"]
+    page_contents = state["page_contents"]
+
+    if state.get("use_batch_api"):
+        summaries = await summarize_with_batch_api(page_numbers, page_contents)
+    else:
+        # Pack pages into batches so each request covers several pages
+        pages = zip(page_numbers, page_contents)
+        batches = list(iter(lambda: list(islice(pages, PAGES_PER_BATCH)), []))
+
+        # Summarize all batches concurrently, reporting progress as each one lands
+        tasks = [summarize(batch) for batch in batches]
+        summaries = []
+        for next_batch in asyncio.as_completed(tasks):
+            batch_summaries = await next_batch
+            summaries.extend(batch_summaries)
+            await adispatch_custom_event(
+                "summaries_ready",
+                {"pages": len(batch_summaries), "total": state["total_pages"]},
+                config=config,
+            )
+    summaries.sort(key=lambda summary: summary.page_number)
+
+    # Prepare this shard's summaries as parallel lists
+    return {
+        "summary_page_numbers": [summary.page_number for summary in summaries],
+        "summary_headings": [summary.heading_sentence for summary in summaries],
+        "summary_key_points": [summary.key_points for summary in summaries],
+    }
 
-    # Summarize all pages concurrently
-    tasks = [summarize(page_data) for page_data in state["extracted_pages"]]
-    summaries = await asyncio.gather(*tasks)
+async def store_summaries(state: State):
+    """
+    Caches the merged shard summaries so later queries on the same document skip summarization.
+    A partial set is not cached, so the next query re-summarizes instead of losing pages for good.
+    """
+    document_id = state.get("document_id")
+    if not document_id:
+        return {}
+
+    expected_pages = {page_number for page_number, _ in substantive_pages(state["page_numbers"], state["page_contents"])}
+    missing_pages = expected_pages - set(state["summary_page_numbers"])
+    if missing_pages:
+        print(f"Not caching summaries; missing pages: {', '.join(map(str, sorted(missing_pages)))}")
+    else:
+        await asyncio.to_thread(
+            document_cache.save,
+            document_id,
+            summary_page_numbers=state["summary_page_numbers"],
+            summary_headings=state["summary_headings"],
+            summary_key_points=state["summary_key_points"],
+        )
+    return {}
 
-    # Prepare summarized pages
-    summarized_pages = [
-        {
-            "page_number": summary.page_number,
-            "heading_sentence": summary.heading_sentence,
-            "key_points": summary.key_points,
-        }
-        for summary in summaries
-    ]
-    return {"summarized_pages": summarized_pages}
+def fused_search_budget(page_contents: list[str]) -> int:
+    """
+    Returns the most raw page characters worth embedding in a fused search prompt.
+    Fusing pays off while the document is no larger than what verify_results would send instead:
+    relevant_window falls back to the whole page unless a point overlaps it verbatim, which is
+    the common case for paraphrased points, so each result costs about one page plus the prompt.
+    """
+    if FUSED_SEARCH_CHAR_BUDGET:
+        return FUSED_SEARCH_CHAR_BUDGET
+    average_page_chars = sum(map(len, page_contents)) / max(len(page_contents), 1)
+    return int(MAX_SEARCH_RESULTS * (average_page_chars + VERIFY_PROMPT_CHARS))
 
 async def search_summaries(state: State):
     query = state.get("query")
-    summaries = state.get("summarized_pages")
+    summary_page_numbers = state.get("summary_page_numbers")
 
     if not query:
         raise ValueError("Query not found.")
-    if not summaries:
+    if not summary_page_numbers:
         raise ValueError("Summaries not found.")
 
-    # Combine summaries into a text block
-    concatenated_summaries = "\n\n".join(
-        f"Page {summary['page_number']}:\n"
-        f"- **Heading Sentence**: {summary['heading_sentence']}\n"
-        f"- **Key Points**:\n"
-        f"  1. {summary['key_points'][0]}\n"
-        f"  2. {summary['key_points'][1]}\n"
-        f"  3. {summary['key_points'][2]}"
-        for summary in summaries
+    # Combine summaries into a text block, tolerating any number of key points
+    parts = []
+    append = parts.append
+    for page_number, heading, key_points in zip(
+        summary_page_numbers, state["summary_headings"], state["summary_key_points"]
+    ):
+        append(
+            f"Page {page_number}:\n"
+            f"- **Heading Sentence**: {heading}\n"
+            f"- **Key Points**:\n"
+            + "".join(f"  {i}. {point}\n" for i, point in enumerate(key_points, 1))
+        )
+    concatenated_summaries = "\n".join(parts)
+
+    # Fuse verification into the search when the raw pages fit in one prompt
+    page_numbers = state.get("page_numbers", [])
+    page_contents = state.get("page_contents", [])
+    fused = (
+        not state.get("strict_verification")
+        and sum(map(len, page_contents)) <= fused_search_budget(page_contents)
     )
 
     # Define the search prompt
-    search_prompt = (
-        f"The following are summaries from a document:\n\n"
-        f"{concatenated_summaries}\n\n"
-        f"Based on the query: \"{query}\", extract the top 10 relevant points from the summary. "
-        f"Each point should be associated with exactly one page number as its source. "
-        f"Please respond using the following structure in valid JSON format:\n"
-        f"{search_result_list_parser.get_format_instructions()}"
-    )
-
-    # Use the LLM to perform the search
-    response = await llm.ainvoke([{"role": "user", "content": search_prompt}])
-    print("Raw search response:", response.content)
+    if fused:
+        page_texts = "\n\n".join(
+            f"Page {page_number} Content:\n{normalizer_tool.normalize(content)}"
+            for page_number, content in zip(page_numbers, page_contents)
+        )
+        search_prompt = (
+            f"The following are summaries from a document:\n\n"
+            f"{concatenated_summaries}\n\n"
+            f"The following is the raw content of each page:\n\n"
+            f"{page_texts}\n\n"
+            f"Based on the query: \"{query}\", use the summaries to find the top {MAX_SEARCH_RESULTS} relevant points, "
+            f"then check each one against the raw content of its page. "
+            f"Each point should be associated with exactly one page number as its source. "
+            f"Only return points that are directly supported by that page's raw content, quoting it verbatim "
+            f"where possible: numerical data must match exactly and there must be no hallucination."
+        )
+    else:
+        search_prompt = (
+            f"The following are summaries from a document:\n\n"
+            f"{concatenated_summaries}\n\n"
+            f"Based on the query: \"{query}\", extract the top {MAX_SEARCH_RESULTS} relevant points from the summary. "
+            f"Each point should be associated with exactly one page number as its source."
+        )
 
     try:
-        # Parse the response using Pydantic
-        parsed_results = search_result_list_parser.parse(response.content)
-        return {"search_results": parsed_results.results}
+        # Use the schema-pinned LLM to perform the search
+        search_llm = llm_clients().llm.bind(response_format=SEARCH_FORMAT)
+        response = await search_llm.ainvoke([{"role": "user", "content": search_prompt}])
+        parsed_results = SEARCH_RESULTS_TA.validate_json(response.content)
+        print("Search results:", parsed_results.results)
     except Exception as e:
         print(f"Error parsing search results: {e}")
         raise ValueError("Failed to parse search results.")
 
+    if not fused:
+        return {"search_results": parsed_results.results, "search_verified": False}
+
+    # Accept only verbatim excerpts of real pages; anything else still goes through verify_results
+    page_by_num = dict(zip(page_numbers, page_contents))
+    verified_results = []
+    unverified_results = []
+    for result in parsed_results.results:
+        raw_content = page_by_num.get(result.claimed_page)
+        if raw_content is None:
+            print(f"Dropping search result citing unknown Page {result.claimed_page}")
+            continue
+        verified_point = verbatim_match(result, normalizer_tool.normalize(raw_content))
+        if verified_point:
+            verified_results.append(verified_point)
+        else:
+            unverified_results.append(result)
+
+    if unverified_results:
+        return {
+            "search_results": unverified_results,
+            "verified_results": verified_results,
+            "search_verified": False,
+        }
+    return {
+        **present_verified_results(verified_results),
+        "search_results": parsed_results.results,
+        "search_verified": True,
+    }
+
+def verbatim_match(result: SearchResult, raw_content: str):
+    """
+    Returns `result` as a verified point when its text appears verbatim in the (normalized) page.
+    A verbatim excerpt already proves origin, so no LLM call is needed.
+    """
+    cleaned_content = normalizer_tool.normalize(result.content)
+    if cleaned_content and cleaned_content.lower() in raw_content.lower():
+        return {
+            "content": cleaned_content,
+            "source": f"Page {result.claimed_page}",
+            "explanation": "Exact substring match.",
+        }
+    return None
+
+def relevant_window(content: str, raw_content: str) -> str:
+    """
+    Returns the slice of `raw_content` around the best match for `content`.
+    Falls back to the full page when no overlap is long enough to trust.
+    """
+    matcher = SequenceMatcher(None, raw_content.lower(), content.lower(), autojunk=False)
+    match = matcher.find_longest_match(0, len(raw_content), 0, len(content))
+    if match.size < VERIFY_MIN_MATCH:
+        return raw_content
+
+    # Align the whole of `content` against the page around the anchoring overlap
+    start = match.a - match.b
+    end = start + len(content)
+    return raw_content[max(0, start - VERIFY_CONTEXT_CHARS):end + VERIFY_CONTEXT_CHARS]
+
+def route_after_search(state: State):
+    """Skips the verify_results node when the search already verified every result."""
+    return END if state.get("search_verified") else "verify_results"
+
 async def verify_results(state: State):
     search_results = state.get("search_results", [])
-    extracted_pages = state.get("extracted_pages", [])
+    page_numbers = state.get("page_numbers", [])
 
     if not search_results:
         raise ValueError("No search results to verify.")
-    if not extracted_pages:
+    if not page_numbers:
         raise ValueError("No extracted pages to verify against.")
 
+    # Index pages by number once so each lookup is O(1)
+    page_by_num = dict(zip(page_numbers, state["page_contents"]))
+
+    # Cap in-flight requests so many search results don't trigger 429 retry storms
+    llm_sem = llm_semaphore()
+
     async def verify(result: SearchResult):
         claimed_page = result.claimed_page
         content = result.content
 
-        # Find the matching page in extracted_pages
-        matching_page = next(
-            (page for page in extracted_pages if page["page_number"] == claimed_page),
-            None
-        )
-        if not matching_page:
+        # Find the matching page
+        raw_content = page_by_num.get(claimed_page)
+        if raw_content is None:
             return None  # If no matching page is found, skip verification
 
-        raw_content = normalizer_tool.normalize(matching_page["content"])
+        raw_content = normalizer_tool.normalize(raw_content)
+        cleaned_content = normalizer_tool.normalize(content)  # Final cleanup
+
+        # A verbatim excerpt already proves origin, so skip the LLM call
+        verified_point = verbatim_match(result, raw_content)
+        if verified_point:
+            return verified_point
 
         # Define the strict verification prompt
         verification_prompt = (
             f"Does the following summary originate from the content of Page {claimed_page}?\n\n"
             f"Summary:\n{content}\n\n"
-            f"Page {claimed_page} Content:\n{raw_content}\n\n"
+            f"Page {claimed_page} Content:\n{relevant_window(cleaned_content, raw_content)}\n\n"
             f"Check the following:\n"
             f"- Does the numerical data match exactly?\n"
             f"- Are qualitative descriptions consistent and supported by the content?\n"
@@ -150,19 +531,15 @@ async def verify_results(state: State):
             f"- **No broken words or line breaks in numeric data**.\n"
             f"- **Preserve all paragraph and list structures correctly**.\n"
             f"- **Ensure no hallucination or incorrect modifications.**\n\n"
-            f"- Ensure there is no hallucination.\n\n"
-            f"Respond with the following structure in valid JSON format:\n"
-            f"{verification_parser.get_format_instructions()}"
+            f"- Ensure there is no hallucination."
         )
 
-        # Call the LLM for verification
-        response = await llm.ainvoke([{"role": "user", "content": verification_prompt}])
-
         try:
-            # Parse the verification response
-            verification_result = verification_parser.parse(response.content)
-            cleaned_content = normalizer_tool.normalize(content)  # Final cleanup
-
+            # Call the schema-pinned LLM for verification
+            async with llm_sem:
+                verify_llm = llm_clients().llm.bind(response_format=VERIFY_FORMAT)
+                response = await verify_llm.ainvoke([{"role": "user", "content": verification_prompt}])
+            verification_result = VERIFICATION_TA.validate_json(response.content)
             if verification_result.valid:
                 return {
                     "content": cleaned_content,
@@ -177,10 +554,12 @@ async def verify_results(state: State):
     tasks = [verify(result) for result in search_results]
     all_verified_points = await asyncio.gather(*tasks)
 
-    # Filter out None values and format the results
-    verified_results = [point for point in all_verified_points if point]
+    # Filter out None values and add them to any points the search already verified
+    verified_results = state.get("verified_results", []) + [point for point in all_verified_points if point]
+    return present_verified_results(verified_results)
 
-    # Present the verified results
+def present_verified_results(verified_results):
+    """Formats verified results as the assistant's reply."""
     formatted_results = "\n\n".join(
         f"{result['content']} (Source: {result['source']})"
         for result in verified_results
@@ -1,6 +1,5 @@
-from pydantic import BaseModel, Field
-from langchain_core.output_parsers import PydanticOutputParser
-from typing import List
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import List, Type
 
 
 # Define the Pydantic model for structured output
@@ -8,21 +7,37 @@ class InputData(BaseModel):
     pdf_path: str = Field(description="The path to the PDF file.")
     query: str = Field(description="The user's query or purpose.")
 class PageSummary(BaseModel):
+    model_config = ConfigDict(extra="forbid")
     page_number: int = Field(description="The page number of the PDF.")
     heading_sentence: str = Field(description="A single sentence summarizing the main idea of the page.")
     key_points: List[str] = Field(description="Three key points summarizing the content.")
+class BatchPageSummaries(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    summaries: List[PageSummary] = Field(description="One summary per page, in the order the pages were given.")
 class SearchResult(BaseModel):
+    model_config = ConfigDict(extra="forbid")
     content: str = Field(description="The relevant information extracted from the summaries.")
     claimed_page: int = Field(description="The single page where the information originates.")
 class SearchResultList(BaseModel):
+    model_config = ConfigDict(extra="forbid")
     results: List[SearchResult] = Field(description="A list of search results.")
 class VerificationResult(BaseModel):
+    model_config = ConfigDict(extra="forbid")
     valid: bool = Field(description="Indicates whether the summary matches the page content.")
     explanation: str = Field(description="Provides the reason for the validity of the match.")
 
-# Create parsers
-input_parser = PydanticOutputParser(pydantic_object=InputData)
-summary_parser = PydanticOutputParser(pydantic_object=PageSummary)
-search_result_parser = PydanticOutputParser(pydantic_object=SearchResult)
-search_result_list_parser = PydanticOutputParser(pydantic_object=SearchResultList)
-verification_parser = PydanticOutputParser(pydantic_object=VerificationResult)
+# Type adapters validate raw JSON in pydantic-core, skipping LangChain's parser layer
+PAGE_SUMMARY_TA = TypeAdapter(PageSummary)
+BATCH_SUMMARIES_TA = TypeAdapter(BatchPageSummaries)
+SEARCH_RESULTS_TA = TypeAdapter(SearchResultList)
+VERIFICATION_TA = TypeAdapter(VerificationResult)
+
+def json_schema_format(model: Type[BaseModel]) -> dict:
+    """
+    Returns an OpenAI `response_format` that enforces `model`'s JSON schema server-side.
+    Unlike binding the model class, the response stays plain text, so the LLM cache can store it.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": model.__name__, "schema": model.model_json_schema(), "strict": True},
+    }
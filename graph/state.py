@@ -1,14 +1,32 @@
 from typing import Annotated, List
+import operator
 from typing_extensions import TypedDict
-from .parsers import PageSummary, SearchResult, VerificationResult
+from .parsers import SearchResult, VerificationResult
 from langgraph.graph.message import add_messages
 
 
 class State(TypedDict):
     messages: Annotated[list, add_messages]
     pdf_path: str
+    document_id: str
+    use_batch_api: bool
+    strict_verification: bool
     query: str
-    extracted_pages: List[dict]
-    summarized_pages: List[PageSummary]
+    # Extracted pages, as parallel lists indexed by position
+    page_numbers: List[int]
+    page_contents: List[str]
+    # Page summaries, as parallel lists indexed by position; each shard appends its own
+    summary_page_numbers: Annotated[List[int], operator.add]
+    summary_headings: Annotated[List[str], operator.add]
+    summary_key_points: Annotated[List[List[str]], operator.add]
     search_results: List[SearchResult]
+    search_verified: bool
     verified_results: List[VerificationResult]
+
+
+class ShardState(TypedDict):
+    """Input sent to each parallel summarize_page run."""
+    page_numbers: List[int]
+    page_contents: List[str]
+    total_pages: int
+    use_batch_api: bool
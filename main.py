@@ -1,9 +1,14 @@
 import asyncio
-from graph import process_input, process_pdf, summarize_page, search_summaries, verify_results
+import hashlib
+from graph import process_input, process_pdf, summarize_page, store_summaries, search_summaries, verify_results, route_to_summarize, route_after_search
 from graph import State
-from tools import llm, pdf_tool
+from tools import close_llm_clients
+from utils.logging import log_event
 from langgraph.graph import StateGraph, START, END
 
+# Nodes whose output messages make up the assistant's reply
+RESPONSE_NODES = {"search_summaries", "verify_results"}
+
 # Initialize LangGraph
 graph_builder = StateGraph(State)
 
@@ -11,40 +16,74 @@ graph_builder = StateGraph(State)
 graph_builder.add_node("process_input", process_input)
 graph_builder.add_node("process_pdf", process_pdf)
 graph_builder.add_node("summarize_page", summarize_page)
+graph_builder.add_node("store_summaries", store_summaries)
 graph_builder.add_node("search_summaries", search_summaries)
 graph_builder.add_node("verify_results", verify_results)
 
 graph_builder.add_edge(START, "process_input")
 graph_builder.add_edge("process_input", "process_pdf")
-graph_builder.add_edge("process_pdf", "summarize_page")
-graph_builder.add_edge("summarize_page", "search_summaries")
-graph_builder.add_edge("search_summaries", "verify_results")
+graph_builder.add_conditional_edges("process_pdf", route_to_summarize, ["summarize_page", "search_summaries"])
+graph_builder.add_edge("summarize_page", "store_summaries")
+graph_builder.add_edge("store_summaries", "search_summaries")
+graph_builder.add_conditional_edges("search_summaries", route_after_search, ["verify_results", END])
 graph_builder.add_edge("verify_results", END)
 
 # Compile the graph
 graph = graph_builder.compile()
 
 
+def pdf_document_id(pdf_path: str) -> str:
+    """Keys the document cache by PDF content, so the same document maps to the same entry."""
+    digest = hashlib.md5()
+    with open(pdf_path, "rb") as pdf_file:
+        for chunk in iter(lambda: pdf_file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 # Function to process the document and query asynchronously
-async def process_query(pdf_path: str, user_query: str):
-    """Handles the processing of a PDF file with a user query."""
+async def process_query(pdf_path: str, user_query: str, use_batch_api: bool = False, strict_verification: bool = False):
+    """
+    Handles the processing of a PDF file with a user query.
+    Set `use_batch_api` to summarize through the OpenAI Batch API (cheaper, but not interactive).
+    Set `strict_verification` to verify each search result with its own LLM call instead of during the search.
+    """
     initial_state = {
         "messages": [{"role": "user", "content": user_query}],
         "pdf_path": pdf_path,
+        "document_id": pdf_document_id(pdf_path),
+        "use_batch_api": use_batch_api,
+        "strict_verification": strict_verification,
         "query": user_query,
-        "extracted_pages": [],
-        "summarized_pages": [],
+        "page_numbers": [],
+        "page_contents": [],
+        "summary_page_numbers": [],
+        "summary_headings": [],
+        "summary_key_points": [],
         "search_results": [],
+        "search_verified": False,
         "verified_results": [],
     }
 
     results = []
-    async for event in graph.astream(initial_state):
-        for value in event.values():
-            if "messages" in value:
-                last_message = value["messages"][-1]
-                if isinstance(last_message, dict) and "content" in last_message:
-                    results.append(last_message["content"])
+    pages_summarized = 0
+    try:
+        async for event in graph.astream_events(initial_state, version="v2"):
+            kind = event["event"]
+            if kind == "on_custom_event" and event["name"] == "summaries_ready":
+                pages_summarized += event["data"]["pages"]
+                log_event(f"Summarized {pages_summarized}/{event['data']['total']} pages")
+            # Node-level runs are the ones named after the node they belong to
+            elif kind == "on_chain_end" and event["name"] == event["metadata"].get("langgraph_node"):
+                log_event(f"{event['name']} finished")
+                value = event["data"].get("output")
+                if event["name"] in RESPONSE_NODES and isinstance(value, dict) and "messages" in value:
+                    last_message = value["messages"][-1]
+                    if isinstance(last_message, dict) and "content" in last_message:
+                        results.append(last_message["content"])
+    finally:
+        # Pooled connections belong to this query's event loop, so close them before it ends
+        await close_llm_clients()
 
     return results
 
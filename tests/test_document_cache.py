@@ -0,0 +1,45 @@
+import asyncio
+
+import graph.nodes as nodes
+from tools.tools import DocumentCache
+
+
+PAGE_TEXT = "Lending volumes in Indonesia grew 12% year on year, driven by digital platforms and SME demand."
+
+
+def test_save_merges_fields_and_evicts_least_recently_used(tmp_path):
+    cache = DocumentCache(str(tmp_path / "cache.db"), max_documents=2)
+    cache.save("a", page_numbers=[1], page_contents=["x"])
+    cache.save("a", summary_headings=["h"])
+    assert cache.load("a") == {"page_numbers": [1], "page_contents": ["x"], "summary_headings": ["h"]}
+
+    cache.save("b", page_numbers=[2])
+    cache.save("c", page_numbers=[3])
+    assert cache.load("a") is None
+    assert cache.load("b") == {"page_numbers": [2]}
+    assert cache.load("c") == {"page_numbers": [3]}
+
+
+def summarized_state(summary_page_numbers):
+    return {
+        "document_id": "doc",
+        "page_numbers": [1, 2, 3, 4],
+        "page_contents": [PAGE_TEXT, PAGE_TEXT, PAGE_TEXT, "4"],  # Page 4 is too short to summarize
+        "summary_page_numbers": summary_page_numbers,
+        "summary_headings": ["h"] * len(summary_page_numbers),
+        "summary_key_points": [["a", "b", "c"]] * len(summary_page_numbers),
+    }
+
+
+def test_store_summaries_skips_partial_summary_sets(tmp_path, monkeypatch):
+    cache = DocumentCache(str(tmp_path / "cache.db"))
+    monkeypatch.setattr(nodes, "document_cache", cache)
+    cache.save("doc", page_numbers=[1, 2, 3, 4], page_contents=[PAGE_TEXT] * 4)
+
+    asyncio.run(nodes.store_summaries(summarized_state([1, 3])))
+    assert "summary_page_numbers" not in cache.load("doc")
+
+    # Every substantive page summarized: cached, and the next query skips summarization
+    asyncio.run(nodes.store_summaries(summarized_state([1, 2, 3])))
+    assert cache.load("doc")["summary_page_numbers"] == [1, 2, 3]
+    assert nodes.route_to_summarize(summarized_state([1, 2, 3])) == "search_summaries"
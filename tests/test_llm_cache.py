@@ -0,0 +1,88 @@
+import asyncio
+import os
+
+# ChatOpenAI requires a key even when its transport is mocked
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import httpx
+from langchain_core.globals import set_llm_cache
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+from langchain_openai import ChatOpenAI
+
+from graph.parsers import PAGE_SUMMARY_TA, PageSummary, json_schema_format
+from tools.llm import ValidatedSQLiteCache
+
+
+SUMMARY_JSON = '{"page_number": 1, "heading_sentence": "Lending grew.", "key_points": ["a", "b", "c"]}'
+
+
+def chat_completion(content: str, finish_reason: str = "stop") -> dict:
+    """Builds a minimal OpenAI chat completion payload."""
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o-mini",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content, "refusal": None},
+            "finish_reason": finish_reason,
+            "logprobs": None,
+        }],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+
+
+def invoke_twice(tmp_path, payload: dict, **cache_kwargs):
+    """Sends the same schema-pinned prompt twice; returns the HTTP calls made and the responses."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json=payload)
+
+    set_llm_cache(ValidatedSQLiteCache(database_path=str(tmp_path / "llm_cache.db"), **cache_kwargs))
+    try:
+        llm = ChatOpenAI(
+            model="gpt-4o-mini",
+            temperature=0,
+            seed=42,
+            http_async_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        pinned_llm = llm.bind(response_format=json_schema_format(PageSummary))
+
+        async def run():
+            prompt = [{"role": "user", "content": "Summarize page 1."}]
+            return [await pinned_llm.ainvoke(prompt) for _ in range(2)]
+
+        responses = asyncio.run(run())
+    finally:
+        set_llm_cache(None)
+    return calls, responses
+
+
+def test_schema_pinned_prompt_is_served_from_cache(tmp_path):
+    calls, responses = invoke_twice(tmp_path, chat_completion(SUMMARY_JSON))
+
+    # The second call is a cache hit and still validates
+    assert len(calls) == 1
+    for response in responses:
+        assert PAGE_SUMMARY_TA.validate_json(response.content).page_number == 1
+
+
+def test_truncated_response_is_not_cached(tmp_path):
+    calls, _ = invoke_twice(tmp_path, chat_completion(SUMMARY_JSON[:40], finish_reason="length"))
+
+    # Nothing was stored, so the second call goes back to the API
+    assert len(calls) == 2
+
+
+def test_cache_evicts_oldest_entries(tmp_path):
+    cache = ValidatedSQLiteCache(database_path=str(tmp_path / "llm_cache.db"), max_entries=2)
+    generations = [ChatGeneration(message=AIMessage(SUMMARY_JSON), generation_info={"finish_reason": "stop"})]
+    for prompt in ("first", "second", "third"):
+        cache.update(prompt, "llm", generations)
+
+    assert cache.lookup("first", "llm") is None
+    assert cache.lookup("third", "llm") is not None
@@ -1,2 +1,2 @@
-from .llm import llm
+from .llm import llm_clients, close_llm_clients, LLM_CONCURRENCY
 from .tools import pdf_tool
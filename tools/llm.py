@@ -1,9 +1,115 @@
+from langchain_community.cache import SQLiteCache
+from langchain_core.globals import set_llm_cache
 from langchain_openai import ChatOpenAI
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
-import os
+from sqlalchemy import text
+from typing import NamedTuple
+import asyncio, httpx, orjson, os, weakref
 
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-llm = ChatOpenAI(model="gpt-4o-mini")
+# Max in-flight LLM requests per query, shared by all nodes and shards; tune to your OpenAI rate-limit tier
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "16"))
+
+# Most responses kept in the LLM cache; the oldest are evicted beyond this
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+
+class ValidatedSQLiteCache(SQLiteCache):
+    """
+    SQLiteCache that only stores complete responses and keeps at most `max_entries` of them.
+    The cache is written before the caller parses the response, so a truncated, refused or
+    malformed answer would otherwise be replayed on every rerun of the same prompt.
+    """
+
+    def __init__(self, database_path: str, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        super().__init__(database_path=database_path)
+        self.max_entries = max_entries
+
+    @staticmethod
+    def is_complete(generation, expects_json: bool) -> bool:
+        """Whether a generation finished normally and, for schema-pinned calls, holds valid JSON."""
+        if (generation.generation_info or {}).get("finish_reason") != "stop":
+            return False
+        message = getattr(generation, "message", None)
+        if message is not None and message.additional_kwargs.get("refusal"):
+            return False
+        if expects_json:
+            try:
+                orjson.loads(generation.text)
+            except orjson.JSONDecodeError:
+                return False
+        return True
+
+    def update(self, prompt, llm_string, return_val):
+        expects_json = "response_format" in llm_string
+        if not all(self.is_complete(generation, expects_json) for generation in return_val):
+            return
+        super().update(prompt, llm_string, return_val)
+
+        # Evict the oldest rows (lowest rowid) beyond the cap
+        with self.engine.begin() as connection:
+            connection.execute(
+                text(
+                    f"DELETE FROM {self.cache_schema.__tablename__} WHERE rowid NOT IN "
+                    f"(SELECT rowid FROM {self.cache_schema.__tablename__} ORDER BY rowid DESC LIMIT :limit)"
+                ),
+                {"limit": self.max_entries},
+            )
+
+
+# Persistent response cache keyed by model and prompt, so reruns on the same pages cost nothing
+set_llm_cache(ValidatedSQLiteCache(database_path=".langchain.db"))
+
+# Deterministic sampling keeps cached responses representative of fresh ones
+LLM_MODEL = "gpt-4o-mini"
+LLM_TEMPERATURE = 0
+LLM_SEED = 42
+
+
+class LLMClients(NamedTuple):
+    http_client: httpx.AsyncClient
+    llm: ChatOpenAI
+    # Raw client for endpoints LangChain does not wrap (e.g. the Batch API)
+    openai_client: AsyncOpenAI
+
+
+# One set of clients per event loop: pooled connections belong to the loop that opened them,
+# and app.py and the CLI start a fresh loop (asyncio.run) for every query
+_llm_clients = weakref.WeakKeyDictionary()
+
+def llm_clients() -> LLMClients:
+    """
+    Returns the OpenAI clients for the running event loop, creating them on first use.
+    All calls on the loop share one pooled HTTP/2 client, so connections and TLS sessions are reused.
+    """
+    loop = asyncio.get_running_loop()
+    if loop not in _llm_clients:
+        http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+            timeout=httpx.Timeout(60.0),
+        )
+        _llm_clients[loop] = LLMClients(
+            http_client=http_client,
+            # astream_events would otherwise switch every call to token streaming;
+            # progress is reported per node and per batch, so whole responses are enough
+            llm=ChatOpenAI(
+                model=LLM_MODEL,
+                temperature=LLM_TEMPERATURE,
+                seed=LLM_SEED,
+                disable_streaming=True,
+                http_async_client=http_client,
+            ),
+            openai_client=AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=http_client),
+        )
+    return _llm_clients[loop]
+
+async def close_llm_clients():
+    """Closes the running event loop's clients; call before the loop finishes."""
+    clients = _llm_clients.pop(asyncio.get_running_loop(), None)
+    if clients:
+        await clients.http_client.aclose()
@@ -5,7 +5,7 @@ from langchain_core.callbacks import (
 )
 from langchain_core.tools import BaseTool
 from pydantic import BaseModel, Field
-import pdfplumber, re
+import orjson, pdfplumber, re, sqlite3, time
 
 
 # Define input schema for the tool
@@ -156,6 +156,12 @@ class PDFPlumberTool(BaseTool):
         """
         return self._run(pdf_path, run_manager=run_manager.get_sync())
 
+# Normalization patterns, compiled once and shared by every TextNormalizer call
+BROKEN_COMMA_RE = re.compile(r"(\d+),\s*\n(\d+)")
+BROKEN_NUMBER_RE = re.compile(r"(\d+)\s*\n(\d+)")
+NEWLINE_RE = re.compile(r"\s*\n\s*")
+SPACED_WORD_RE = re.compile(r"\b(\w) (\w) (\w) (\w) (\w) (\w) (\w)\b")
+
 class TextNormalizer:
     """
     A utility class for normalizing text formatting issues.
@@ -178,21 +184,72 @@ class TextNormalizer:
             return ""
 
         # Fix broken commas in numbers
-        text = re.sub(r"(\d+),\s*\n(\d+)", r"\1,\2", text)  
+        text = BROKEN_COMMA_RE.sub(r"\1,\2", text)
 
         # Fix numbers broken by newlines
-        text = re.sub(r"(\d+)\s*\n(\d+)", r"\1\2", text)    
+        text = BROKEN_NUMBER_RE.sub(r"\1\2", text)
 
         # Remove unintended newlines
-        text = re.sub(r"\s*\n\s*", " ", text)               
+        text = NEWLINE_RE.sub(" ", text)
 
         # Fix cases where "b i l l i o n" is incorrectly spaced
-        text = re.sub(r"\b(\w) (\w) (\w) (\w) (\w) (\w) (\w)\b", r"\1\2\3\4\5\6\7", text)
+        text = SPACED_WORD_RE.sub(r"\1\2\3\4\5\6\7", text)
 
         return text.strip()
 
+class DocumentCache:
+    """
+    Persists each document's extracted pages and summaries in SQLite, keyed by a hash of the PDF.
+    Stores one row per document, overwritten in place, and keeps only the most recently used
+    `max_documents`, so the file stays bounded no matter how many queries run.
+    """
+
+    def __init__(self, database_path: str, max_documents: int = 50):
+        self.database_path = database_path
+        self.max_documents = max_documents
+        with sqlite3.connect(self.database_path) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents "
+                "(document_id TEXT PRIMARY KEY, data BLOB NOT NULL, used_at REAL NOT NULL)"
+            )
+
+    def load(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached fields for a document, or None if it has not been seen.
+
+        Args:
+            document_id (str): Hash of the PDF contents.
+        """
+        with sqlite3.connect(self.database_path) as conn:
+            row = conn.execute("SELECT data FROM documents WHERE document_id = ?", (document_id,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE documents SET used_at = ? WHERE document_id = ?", (time.time(), document_id))
+        return orjson.loads(row[0])
+
+    def save(self, document_id: str, **fields: Any) -> None:
+        """
+        Merges `fields` into the document's cached entry and evicts the least recently used documents.
+
+        Args:
+            document_id (str): Hash of the PDF contents.
+            **fields: State fields to cache (e.g. page_numbers, summary_headings).
+        """
+        data = {**(self.load(document_id) or {}), **fields}
+        with sqlite3.connect(self.database_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO documents (document_id, data, used_at) VALUES (?, ?, ?)",
+                (document_id, orjson.dumps(data), time.time()),
+            )
+            conn.execute(
+                "DELETE FROM documents WHERE document_id NOT IN "
+                "(SELECT document_id FROM documents ORDER BY used_at DESC LIMIT ?)",
+                (self.max_documents,),
+            )
+
 normalizer_tool = TextNormalizer()
 pdf_tool = PDFPlumberTool()
+document_cache = DocumentCache("cache.db")
 
 
 """